@@ -1,5 +1,7 @@
 """This module is responsible for handaling the data acquisition and data cleaning into MADAP"""
 import os
+import ast
+import json
 import pandas as pd
 import numpy as np
 
@@ -81,14 +83,33 @@ def select_data(data, selected_data:str):
         data = np.array(data)
     if isinstance(data[0], str):
         if len(data) == 1:
-            data = np.array(eval(data[0]))
+            data = np.array(parse_literal(data[0]))
         else:
             for i, _ in enumerate(data):
-                data[i] = eval(data[i])
+                data[i] = parse_literal(data[i])
 
     return data
 
 
+def parse_literal(literal:str):
+    """ Parse a number or a (nested) list of numbers stored as a string
+
+    Args:
+        literal (str): The string representation, e.g. "[1.0, 2.0]" or "(1, 2)"
+
+    Returns:
+        The parsed number or list
+    """
+    if literal.lstrip().startswith("["):
+        try:
+            # Plain lists of numbers are parsed much faster by the JSON parser
+            return json.loads(literal)
+        except ValueError:
+            pass
+    # Python-only syntax such as tuples, complex numbers or a bare tuple "1, 2"
+    return ast.literal_eval(literal)
+
+
 def format_list(list_data):
     """ Format the selection plots into a list
 
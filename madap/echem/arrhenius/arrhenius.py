@@ -11,6 +11,7 @@ from sklearn.metrics import mean_squared_error
 from madap.logger import logger
 from madap.utils import utils
 from madap.echem.procedure import EChemProcedure
+from madap.plotting.plotting import wait_for_saved_plots
 from madap.echem.arrhenius.arrhenius_plotting import ArrheniusPlotting as aplt
 
 
@@ -138,6 +139,7 @@ class Arrhenius(EChemProcedure):
         self.analyze()
         self.plot(save_dir=save_dir, plots=plots, optional_name=optional_name)
         self.save_data(save_dir=save_dir, optional_name=optional_name)
+        wait_for_saved_plots()
 
     @property
     def figure(self):
@@ -1,5 +1,4 @@
 """This module handles the plotting of the Arrhenius procedure"""
-from matplotlib import pyplot as plt
 
 from madap.logger import logger
 from madap.plotting.plotting import Plots
@@ -83,15 +82,14 @@ class ArrheniusPlotting(Plots):
         Returns:
             fig, ax: Figure and axis of the subplot.
         """
-        plt.close('all')
         if len(plots)==1:
-            fig = plt.figure(figsize=(3, 3))
+            fig = self.get_fig(figsize=(3, 3))
             spec = fig.add_gridspec(1, 1)
             ax = fig.add_subplot(spec[0,0])
             return fig, [ax]
 
         if len(plots) == 2:
-            fig = plt.figure(figsize=(6, 3))
+            fig = self.get_fig(figsize=(6, 3))
             spec = fig.add_gridspec(1, 2)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2 = fig.add_subplot(spec[0, 1])
@@ -24,6 +24,7 @@ from madap.utils import utils
 from madap.utils.suggested_circuits import suggested_circuits
 from madap.data_acquisition import data_acquisition as da
 from madap.echem.procedure import EChemProcedure
+from madap.plotting.plotting import wait_for_saved_plots
 from madap.echem.e_impedance.e_impedance_plotting import ImpedancePlotting as iplt
 
 warnings.warn("deprecated", DeprecationWarning)
@@ -280,6 +281,11 @@ class EIS(EChemProcedure):
                         optional_name else  utils.assemble_file_name(self.__class__.__name__, "data.csv")
 
         utils.save_data_as_csv(save_dir, data, data_name)
+        # The arrays are also stored in a columnar binary file, which reloads without parsing complex numbers
+        if utils.PARQUET_AVAILABLE:
+            data_name = utils.assemble_file_name(optional_name, self.__class__.__name__, "data.parquet") if \
+                            optional_name else  utils.assemble_file_name(self.__class__.__name__, "data.parquet")
+            utils.save_data_as_parquet(save_dir, data, data_name)
 
     def perform_all_actions(self, save_dir:str, plots:list, optional_name:str = None):
         """ Wrapper function for executing all action
@@ -291,6 +297,7 @@ class EIS(EChemProcedure):
         self.analyze()
         self.plot(save_dir, plots, optional_name=optional_name)
         self.save_data(save_dir=save_dir, optional_name=optional_name)
+        wait_for_saved_plots()
 
     @property
     def figure(self):
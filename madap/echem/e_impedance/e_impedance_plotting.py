@@ -1,7 +1,6 @@
 """Impedance Plotting module."""
 import numpy as np
 import matplotlib.colors as mcl
-from matplotlib import pyplot as plt
 from matplotlib.lines import Line2D
 
 from madap.logger import logger
@@ -196,16 +195,15 @@ class ImpedancePlotting(Plots):
             fig, ax: Figure and axis of the subplot.
         """
 
-        plt.close('all')
         if len(plots)==1:
-            fig = plt.figure(figsize=(3.5,3))
+            fig = self.get_fig(figsize=(3.5,3))
             spec = fig.add_gridspec(1, 1)
             ax = fig.add_subplot(spec[0,0])
             return fig, [ax]
 
         if len(plots) == 2:
             fig_size = 9 if ("nyquist" and "nyquist_fit") in plots else 8.5
-            fig = plt.figure(figsize=(fig_size, 4))
+            fig = self.get_fig(figsize=(fig_size, 4))
             spec = fig.add_gridspec(1, 2)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2= fig.add_subplot(spec[0, 1])
@@ -213,7 +211,7 @@ class ImpedancePlotting(Plots):
 
         if len(plots) == 3:
             fig_size= 7 if ("nyquist" and "nyquist_fit" and "bode") in plots else 6.5
-            fig = plt.figure(figsize=(fig_size, 5))
+            fig = self.get_fig(figsize=(fig_size, 5))
             spec = fig.add_gridspec(2, 2)
             if "residual" in plots:
                 ax1 = fig.add_subplot(spec[0, 0])
@@ -226,7 +224,7 @@ class ImpedancePlotting(Plots):
             return fig, [ax1, ax2, ax3]
 
         if len(plots) == 4:
-            fig = plt.figure(figsize=(7.5, 6))
+            fig = self.get_fig(figsize=(7.5, 6))
             spec = fig.add_gridspec(2, 2)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2= fig.add_subplot(spec[0, 1])
@@ -0,0 +1,344 @@
+""" This module contains the numerical kernels of the chrono amperometry analysis.
+The sliding-window linear fits are compiled with numba when it is installed; otherwise a
+vectorized NumPy implementation is used. Only the NumPy implementation computes the x moments
+once for several fits against the same x; the compiled kernel streams x again for every fit,
+so that the fits of long traces can run in parallel threads."""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# fastmath without the "nnan"/"ninf" flags, the kernel relies on the finiteness checks
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+# The streamed co-moments are recomputed exactly once their rounding error bound exceeds this
+# fraction of them, R^2 of neighbouring windows often differ by less than 1e-9
+_RELATIVE_ERROR = 1e-13
+_EPS = float(np.spacing(1.0))
+# Shorter traces are fitted serially, handing them to another thread costs more than the fit
+_PARALLEL_MIN_POINTS = 50_000
+_FIT_POOL = None
+_FIT_POOL_LOCK = threading.Lock()
+
+
+def use_parallel_fits(n_points):
+    """Whether fits over n_points samples are run in parallel threads: only the compiled
+    kernel releases the GIL, and only long traces on several cores are worth the hand-off.
+
+    Args:
+        n_points (int): Number of points of the fitted trace.
+
+    Returns:
+        bool: True if the fits should be submitted to the pool of get_fit_pool.
+    """
+    return NUMBA_AVAILABLE and n_points >= _PARALLEL_MIN_POINTS and (os.cpu_count() or 1) > 1
+
+
+def get_fit_pool():
+    """Returns the thread pool shared by the parallel fits, created on first use.
+    A task of this pool must not wait on other tasks of the pool.
+
+    Returns:
+        ThreadPoolExecutor: the shared pool, one worker per core.
+    """
+    global _FIT_POOL  # pylint: disable=global-statement
+    with _FIT_POOL_LOCK:
+        if _FIT_POOL is None:
+            _FIT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="madap_fit")
+    return _FIT_POOL
+
+
+def _segment_indices(n_points, window):
+    """Indices of the overlapping segments of two windows, one segment starting every window
+    length, so that every window lies within one segment.
+
+    Args:
+        n_points (int): Number of points of the trace.
+        window (int): Number of points in each window.
+
+    Returns:
+        tuple: Indices of the segments clipped to the trace, and the mask of the indices inside the trace.
+    """
+    n_segments = -(-(n_points - window + 1) // window)
+    indices = np.arange(n_segments)[:, None] * window + np.arange(2 * window)
+    return np.minimum(indices, n_points - 1), indices < n_points
+
+
+def _centered_segments(values, finite, indices, window, n_windows):
+    """Cut values into segments and center each segment on the mean of its finite samples.
+
+    Args:
+        values (np.array): Values of the trace, one row per fit.
+        finite (np.array): Mask of the finite samples of each segment.
+        indices (np.array): Indices of the segments, see _segment_indices.
+        window (int): Number of points in each window.
+        n_windows (int): Number of windows of the trace.
+
+    Returns:
+        tuple: Centered segments with zeros at the non-finite samples, and the offset of each window.
+    """
+    segments = np.where(finite, values[..., indices], 0.0)
+    offset = segments.sum(axis=-1, keepdims=True) / np.maximum(finite.sum(axis=-1, keepdims=True), 1)
+    return np.where(finite, segments - offset, 0.0), np.repeat(offset[..., 0], window, axis=-1)[..., :n_windows]
+
+
+def _window_sums(segments, window, n_windows):
+    """Sums of every window from the prefix sums of the segments.
+
+    Args:
+        segments (np.array): Segments of two windows, see _segment_indices.
+        window (int): Number of points in each window.
+        n_windows (int): Number of windows of the trace.
+
+    Returns:
+        np.array: Sum of each window, one row per fit.
+    """
+    prefix = np.cumsum(segments, axis=-1)
+    prefix = np.concatenate((np.zeros(prefix.shape[:-1] + (1,)), prefix), axis=-1)
+    window_sums = prefix[..., window:2 * window] - prefix[..., :window]
+    return window_sums.reshape(window_sums.shape[:-2] + (-1,))[..., :n_windows]
+
+
+def _best_linear_windows_numpy(x_data, y_data, window):
+    """Find, for several y arrays against the same x, the window with the highest R^2 of a
+    linear fit using prefix sums.
+
+    The trace is cut into overlapping segments of two windows, one starting every window
+    length, so that every window lies within one segment. Each segment is centered on its
+    own mean before the prefix sums are taken, which keeps the cancellation error at the
+    scale of the window instead of the scale of the whole trace. The x moments are
+    computed once and shared by all the fits.
+
+    Args:
+        x_data (np.array): Contiguous float64 x values.
+        y_data (np.array): Contiguous float64 y values, one row per fit.
+        window (int): Number of points in each window.
+
+    Returns:
+        np.array: Start index, slope, intercept and R^2 of the best window, one row per fit.
+    """
+    n_windows = x_data.shape[0] - window + 1
+    indices, in_range = _segment_indices(x_data.shape[0], window)
+
+    # Non-finite samples (e.g. log of a negative current) only invalidate the windows containing them
+    x_finite = in_range & np.isfinite(x_data)[indices]
+    y_finite = in_range & np.isfinite(y_data)[:, indices]
+    x_segments, x_offset = _centered_segments(x_data, x_finite, indices, window, n_windows)
+    y_segments, y_offset = _centered_segments(y_data, y_finite, indices, window, n_windows)
+
+    valid = (_window_sums(~x_finite, window, n_windows) == 0) & (_window_sums(~y_finite, window, n_windows) == 0)
+    sum_x = _window_sums(x_segments, window, n_windows)
+    sum_y = _window_sums(y_segments, window, n_windows)
+    s_xx = _window_sums(x_segments * x_segments, window, n_windows) - sum_x**2 / window
+    s_yy = _window_sums(y_segments * y_segments, window, n_windows) - sum_y**2 / window
+    s_xy = _window_sums(x_segments * y_segments, window, n_windows) - sum_x * sum_y / window
+
+    slopes = np.divide(s_xy, s_xx, out=np.zeros_like(s_xy), where=s_xx > 0)
+    intercepts = (sum_y - slopes * sum_x) / window + y_offset - slopes * x_offset
+    # Like linregress, a window with a constant x or y has r = 0
+    r_squared = np.divide(s_xy**2, s_xx * s_yy, out=np.zeros_like(s_xy),
+                          where=valid & (s_xx > 0) & (s_yy > 0))
+    np.minimum(r_squared, 1.0, out=r_squared)
+
+    best_fits = np.zeros((y_data.shape[0], 4))
+    for k, start in enumerate(np.argmax(r_squared, axis=1)):
+        if r_squared[k, start] > 0:
+            best_fits[k] = start, slopes[k, start], intercepts[k, start], r_squared[k, start]
+    return best_fits
+
+
+def _best_linear_window_numpy(x_data, y_data, window):
+    """Find the window with the highest R^2 of a linear fit using prefix sums.
+
+    Args:
+        x_data (np.array): Contiguous float64 x values.
+        y_data (np.array): Contiguous float64 y values.
+        window (int): Number of points in each window.
+
+    Returns:
+        tuple: Start index, slope, intercept and R^2 of the best window.
+    """
+    start, slope, intercept, r_squared = _best_linear_windows_numpy(x_data, y_data[None, :], window)[0]
+    return int(start), slope, intercept, r_squared
+
+
+def _window_moments(x_data, y_data, start, stop):
+    """Compute the means and co-moments of one window with two passes. Like linregress,
+    a constant x or y has no spread at all, whatever the rounding of its mean.
+
+    Args:
+        x_data (np.array): Contiguous float64 x values.
+        y_data (np.array): Contiguous float64 y values.
+        start (int): First index of the window.
+        stop (int): Index after the last one of the window.
+
+    Returns:
+        tuple: Means of x and y, and the co-moments s_xx, s_yy and s_xy.
+    """
+    mean_x = mean_y = 0.0
+    for j in range(start, stop):
+        mean_x += x_data[j]
+        mean_y += y_data[j]
+    mean_x /= stop - start
+    mean_y /= stop - start
+    s_xx = s_yy = s_xy = 0.0
+    constant_x = constant_y = True
+    for j in range(start, stop):
+        d_x = x_data[j] - mean_x
+        d_y = y_data[j] - mean_y
+        s_xx += d_x * d_x
+        s_yy += d_y * d_y
+        s_xy += d_x * d_y
+        constant_x = constant_x and x_data[j] == x_data[start]
+        constant_y = constant_y and y_data[j] == y_data[start]
+    if constant_x or constant_y:
+        s_xx, s_yy, s_xy = (0.0 if constant_x else s_xx), (0.0 if constant_y else s_yy), 0.0
+    return mean_x, mean_y, s_xx, s_yy, s_xy
+
+
+def _reset_window(moments, x_data, y_data, stop, window):
+    """Recompute the moments of the window ending before stop exactly. The window means
+    become the new reference, so the streamed values stay at the scale of the window.
+
+    Args:
+        moments (np.array): Means, co-moments, error bounds and reference of the window, see _best_linear_window_loop.
+        x_data (np.array): Contiguous float64 x values.
+        y_data (np.array): Contiguous float64 y values.
+        stop (int): Index after the last one of the window.
+        window (int): Number of points in each window.
+    """
+    mean_x, mean_y, s_xx, s_yy, s_xy = _window_moments(x_data, y_data, stop - window, stop)
+    moments[:] = 0.0
+    moments[2], moments[3], moments[4] = s_xx, s_yy, s_xy
+    moments[8], moments[9] = mean_x, mean_y
+
+
+def _slide_window(moments, x_data, y_data, index, window):
+    """Slide a full window by one sample: sample index enters, sample index - window leaves.
+
+    Args:
+        moments (np.array): Means, co-moments, error bounds and reference of the window, see _best_linear_window_loop.
+        x_data (np.array): Contiguous float64 x values.
+        y_data (np.array): Contiguous float64 y values.
+        index (int): Index of the entering sample.
+        window (int): Number of points in each window.
+    """
+    x_in, y_in = x_data[index] - moments[8], y_data[index] - moments[9]
+    x_out, y_out = x_data[index - window] - moments[8], y_data[index - window] - moments[9]
+    mean_x, mean_y = moments[0], moments[1]
+    d_x = x_in - x_out
+    d_y = y_in - y_out
+    new_mean_x = mean_x + d_x / window
+    new_mean_y = mean_y + d_y / window
+    moments[2] += d_x * (x_in - new_mean_x + x_out - mean_x)
+    moments[3] += d_y * (y_in - new_mean_y + y_out - mean_y)
+    moments[4] += d_x * (y_in - new_mean_y) + (x_out - mean_x) * d_y
+    scale_x = abs(x_in) + abs(x_out) + abs(mean_x) + abs(new_mean_x)
+    scale_y = abs(y_in) + abs(y_out) + abs(mean_y) + abs(new_mean_y)
+    moments[5] += _EPS * (abs(moments[2]) + abs(d_x) * scale_x)
+    moments[6] += _EPS * (abs(moments[3]) + abs(d_y) * scale_y)
+    moments[7] += _EPS * (abs(moments[4]) + abs(d_x) * scale_y + abs(d_y) * scale_x)
+    moments[0], moments[1] = new_mean_x, new_mean_y
+
+
+def _is_drifting(moments):
+    """Whether the rounding error bound of a streamed co-moment exceeds _RELATIVE_ERROR of it.
+
+    Args:
+        moments (np.array): Means, co-moments, error bounds and reference of the window, see _best_linear_window_loop.
+
+    Returns:
+        bool: True if the moments have to be recomputed exactly.
+    """
+    return moments[5] > _RELATIVE_ERROR * moments[2] or moments[6] > _RELATIVE_ERROR * moments[3] or \
+        moments[7] * moments[7] > _RELATIVE_ERROR * _RELATIVE_ERROR * moments[2] * moments[3]
+
+
+def _best_linear_window_loop(x_data, y_data, window):
+    """Find the window with the highest R^2 of a linear fit in a single streaming pass.
+
+    The means and co-moments of the window are updated with the sample entering and the
+    sample leaving the window, so no temporary arrays are created. The samples are taken
+    relative to the means of the last exactly computed window, which keeps the updates at
+    the scale of the window (e.g. for timestamps far from zero). A bound of the rounding
+    error of the updates is carried along; the moments are recomputed exactly once per
+    window turnover, or earlier when the bound exceeds _RELATIVE_ERROR of a co-moment,
+    which keeps the work O(N) for regular data. A non-finite sample restarts the window.
+
+    Args:
+        x_data (np.array): Contiguous float64 x values.
+        y_data (np.array): Contiguous float64 y values.
+        window (int): Number of points in each window.
+
+    Returns:
+        tuple: Start index, slope, intercept and R^2 of the best window.
+    """
+    # mean_x, mean_y, s_xx, s_yy, s_xy, the error bounds of s_xx, s_yy and s_xy, and the reference x and y
+    moments = np.zeros(10)
+    n_valid = n_slides = 0
+    best_start, best_slope, best_intercept, best_r_squared = 0, 0.0, 0.0, 0.0
+    for i in range(x_data.shape[0]):
+        if not (np.isfinite(x_data[i]) and np.isfinite(y_data[i])):
+            n_valid = 0
+            continue
+
+        if n_valid < window:
+            n_valid += 1
+            if n_valid < window:
+                continue
+            n_slides = 0
+            _reset_window(moments, x_data, y_data, i + 1, window)
+        else:
+            n_slides += 1
+            _slide_window(moments, x_data, y_data, i, window)
+            if n_slides >= window or _is_drifting(moments):
+                n_slides = 0
+                _reset_window(moments, x_data, y_data, i + 1, window)
+        if moments[2] <= 0 or moments[3] <= 0:
+            continue
+
+        r_squared = min(moments[4] * moments[4] / (moments[2] * moments[3]), 1.0)
+        if r_squared > best_r_squared:
+            best_start = i - window + 1
+            best_slope = moments[4] / moments[2]
+            best_intercept = moments[9] + moments[1] - best_slope * (moments[8] + moments[0])
+            best_r_squared = r_squared
+    return best_start, best_slope, best_intercept, best_r_squared
+
+
+if NUMBA_AVAILABLE:
+    _window_moments = njit(cache=True, nogil=True)(_window_moments)
+    _reset_window = njit(cache=True, nogil=True)(_reset_window)
+    _slide_window = njit(cache=True, nogil=True, fastmath=_FASTMATH)(_slide_window)
+    _is_drifting = njit(cache=True, nogil=True)(_is_drifting)
+    best_linear_window = njit(cache=True, nogil=True, fastmath=_FASTMATH)(_best_linear_window_loop)
+
+    def best_linear_windows(x_data, y_data, window):
+        """Run the streaming fit for every row of y_data against the same x_data. Each row streams
+        x_data again, the x moments are not shared between the rows as in the NumPy implementation.
+        The compiled kernel releases the GIL, so the rows of long traces are fitted in parallel threads;
+        the first row is fitted in the calling thread.
+
+        Args:
+            x_data (np.array): Contiguous float64 x values.
+            y_data (np.array): Contiguous float64 y values, one row per fit.
+            window (int): Number of points in each window.
+
+        Returns:
+            np.array: Start index, slope, intercept and R^2 of the best window, one row per fit.
+        """
+        if y_data.shape[0] > 1 and use_parallel_fits(x_data.shape[0]):
+            pending = [get_fit_pool().submit(best_linear_window, x_data, y_row, window) for y_row in y_data[1:]]
+            best_fits = [best_linear_window(x_data, y_data[0], window)] + [fit.result() for fit in pending]
+        else:
+            best_fits = [best_linear_window(x_data, y_row, window) for y_row in y_data]
+        return np.array(best_fits, dtype=np.float64).reshape(-1, 4)
+else:
+    best_linear_window = _best_linear_window_numpy
+    best_linear_windows = _best_linear_windows_numpy
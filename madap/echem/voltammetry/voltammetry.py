@@ -3,11 +3,11 @@ import os
 
 import numpy as np
 import scipy.constants as const
-from scipy.stats import linregress
 
 from madap.utils import utils
 from madap.logger import logger
 from madap.echem.procedure import EChemProcedure
+from madap.echem.voltammetry._ca_kernels import best_linear_windows
 
 
 
@@ -18,10 +18,12 @@ class Voltammetry(EChemProcedure):
     """ This class defines the voltammetry method."""
     def __init__(self, voltage, current, time, args, charge=None) -> None:
         """Initialize the voltammetry method.
+        The current and time are stored as contiguous float64 arrays in np_current and np_time.
+
         Args:
             voltage (list): list of voltages
-            current (list): list of currents
-            time (list): list of times
+            current (list): one-dimensional list or array of currents
+            time (list): one-dimensional list or array of times
             charge (list): list of charges
             args (argparse.Namespace): arguments
         """
@@ -33,13 +35,16 @@ class Voltammetry(EChemProcedure):
         self.np_voltage = np.array(voltage) # Unit: V
 
         self.current = current
-        self.np_current = np.array(self.current) # Unit: A
+        self.np_current = np.ascontiguousarray(self.current, dtype=np.float64) # Unit: A
 
         self.time = time
-        self.np_time = np.array(self.time) # Unit: s
+        self.np_time = np.ascontiguousarray(self.time, dtype=np.float64) # Unit: s
+        if self.np_time.ndim != 1 or self.np_current.ndim != 1:
+            log.error("Time and current must be one-dimensional.")
+            raise ValueError("Time and current must be one-dimensional")
 
         self.cumulative_charge = self._calculate_charge() if charge is None else charge # Unit: C
-        self.np_cumulative_charge = np.array(self.cumulative_charge) # Unit: C
+        self.np_cumulative_charge = np.asarray(self.cumulative_charge) # Unit: C
 
         self.mass_of_active_material = float(args.mass_of_active_material) if args.mass_of_active_material is not None else None # Unit: g
         self.electrode_area = float(args.electrode_area) if args.electrode_area is not None else 1 # Unit: cm^2
@@ -128,6 +133,28 @@ class Voltammetry(EChemProcedure):
             raise ValueError("Time unit not supported")
 
 
+    def linear_fit(self, x_data, y_data):
+        """
+        Fit a line through the provided data with the closed-form least squares solution.
+
+        Args:
+            x_data (np.array): x values of the data.
+            y_data (np.array): y values of the data.
+
+        Returns:
+            tuple: Slope, intercept and R-squared value of the linear fit.
+        """
+        x_data = np.asarray(x_data, dtype=np.float64)
+        y_data = np.asarray(y_data, dtype=np.float64)
+        x_mean, y_mean = x_data.mean(), y_data.mean()
+        x_dev, y_dev = x_data - x_mean, y_data - y_mean
+        s_xx, s_yy, s_xy = x_dev @ x_dev, y_dev @ y_dev, x_dev @ y_dev
+        slope = s_xy / s_xx
+        # Like linregress, a constant y has r = 0
+        r_squared = s_xy * s_xy / (s_xx * s_yy) if s_yy > 0 else 0.0
+        return slope, y_mean - slope * x_mean, r_squared
+
+
     def analyze_best_linear_fit(self, x_data, y_data):
         """
         Find the best linear region for the provided data.
@@ -144,25 +171,40 @@ class Voltammetry(EChemProcedure):
                 intercept (float): Intercept of the best linear fit.
                 r_squared (float): R-squared value of the best linear fit.
         """
+        return self.analyze_best_linear_fits(x_data, {"fit": y_data})["fit"]
 
-        best_fit = {'start': 0, 'end': self.window_size, 'r_squared': 0, 'slope': 0, 'intercept': 0}
-        for start in range(len(x_data) - self.window_size + 1):
-            end = start + self.window_size
-            slope, intercept, r_value, _, _ = linregress(x_data[start:end], y_data[start:end])
-            r_squared = r_value**2
-            if r_squared > best_fit['r_squared']:
-                best_fit.update({'start': start, 'end': end, 'r_squared': r_squared, 'slope': slope, 'intercept': intercept})
-        log.info(f"Best linear fit found from {best_fit['start']} to {best_fit['end']} with R^2 = {best_fit['r_squared']}")
-        return best_fit
 
+    def analyze_best_linear_fits(self, x_data, y_data):
+        """
+        Find the best linear region for several transforms of the current against the same x data.
+        The x data is only traversed once for all the fits.
 
-    def _calculate_charge(self):
-        """ Calculate the cumulative charge passed in a voltammetry experiment."""
-        # Calculate the time intervals (delta t)
-        delta_t = np.diff(self.np_time)
+        Args:
+            x_data (np.array): Transformed time array (e.g., t^(-1/2) for diffusion or time for kinetics).
+            y_data (dict): Name and array of each current or transformed current (e.g., log(current)).
+
+        Returns:
+            best fits (dict): Dictionary with the best fit of each name, see analyze_best_linear_fit.
+        """
+        window = self.window_size
+        best_fits = {name: {'start': 0, 'end': window, 'r_squared': 0, 'slope': 0, 'intercept': 0} for name in y_data}
+        if 2 <= window <= len(x_data):
+            fits = best_linear_windows(np.ascontiguousarray(x_data, dtype=np.float64),
+                                       np.ascontiguousarray(list(y_data.values()), dtype=np.float64),
+                                       window)
+            for best_fit, (start, slope, intercept, r_squared) in zip(best_fits.values(), fits):
+                if r_squared > best_fit['r_squared']:
+                    best_fit.update({'start': int(start), 'end': int(start) + window, 'r_squared': float(r_squared),
+                                     'slope': float(slope), 'intercept': float(intercept)})
+        for best_fit in best_fits.values():
+            log.info(f"Best linear fit found from {best_fit['start']} to {best_fit['end']} with R^2 = {best_fit['r_squared']}")
+        return best_fits
 
-        # Calculate the charge for each interval as the product of the interval duration and the current at the end of the interval
-        interval_charges = delta_t * self.np_current[1:]
 
-        # Compute the cumulative charge
-        return np.cumsum(np.insert(interval_charges, 0, 0)).tolist()
+    def _calculate_charge(self):
+        """ Calculate the cumulative charge passed in a voltammetry experiment."""
+        # The charge of each interval is the product of the interval duration (delta t) and the current
+        # at the end of the interval, accumulated directly behind the zero charge of the first point
+        cumulative_charge = np.zeros_like(self.np_time)
+        np.cumsum(np.diff(self.np_time) * self.np_current[1:], out=cumulative_charge[1:])
+        return cumulative_charge
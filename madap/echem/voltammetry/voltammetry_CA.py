@@ -1,12 +1,15 @@
 """ This module defines the cyclic amperometry methods. It is a subclass of the Voltammetry class  and the EChemProcedure class.
 It contains the cyclic amperometry methods for analyzing the data and plotting the results."""
 import os
+from functools import cached_property
 
 import numpy as np
 
 from madap.utils import utils
 from madap.echem.voltammetry.voltammetry import Voltammetry
+from madap.echem.voltammetry._ca_kernels import get_fit_pool, use_parallel_fits
 from madap.echem.procedure import EChemProcedure
+from madap.plotting.plotting import wait_for_saved_plots
 from madap.logger import logger
 
 from madap.echem.voltammetry.voltammetry_plotting import VoltammetryPlotting as voltPlot
@@ -15,7 +18,8 @@ log = logger.get_logger("cyclic_amperometry")
 
 
 class Voltammetry_CA(Voltammetry, EChemProcedure):
-    """ This class defines the chrono amperometry method."""
+    """ This class defines the chrono amperometry method.
+    The current and time have to be one-dimensional and are analyzed as contiguous float64 arrays."""
     def __init__(self, current, voltage, time, args, charge=None) -> None:
         super().__init__(voltage, current, time, args, charge=charge)
         self.applied_voltage = float(args.applied_voltage) if args.applied_voltage is not None else None # Unit: V
@@ -24,33 +28,73 @@ class Voltammetry_CA(Voltammetry, EChemProcedure):
         self.reaction_rate_constant = None # Unit: 1/s or cm^3/mol/s
         self.best_fit_reaction_rate = None
         self.best_fit_diffusion = None
+        # pi / (nFAC)^2 of the Cottrell equation only depends on the experiment settings
+        self._cottrell_inv_denom = np.pi / (self.number_of_electrons * self.faraday_constant * \
+                                            self.electrode_area * self.concentration_of_active_material) ** 2
+
+    # Cached transforms that are dropped when the array they derive from is replaced
+    _CACHED_TRANSFORMS = {"np_time": ("_t_inv_sqrt",), "np_current": ("_log_current", "_inv_current")}
+
+    def __setattr__(self, name, value):
+        """Set an attribute and drop the cached transforms of np_time or np_current when one of
+        them is replaced. Changes made in place to the arrays are not detected.
+
+        Args:
+            name (str): Name of the attribute.
+            value (obj): Value of the attribute.
+        """
+        for cached_name in self._CACHED_TRANSFORMS.get(name, ()):
+            self.__dict__.pop(cached_name, None)
+        super().__setattr__(name, value)
+
+    @cached_property
+    def _t_inv_sqrt(self):
+        """t^(-1/2) of the time after the first point, computed once. Samples at zero time are NaN
+        and skipped by the fits."""
+        time = self.np_time[1:]
+        t_inv_sqrt = np.reciprocal(time, out=np.full(time.shape, np.nan), where=time != 0)
+        return np.sqrt(t_inv_sqrt, out=t_inv_sqrt)
+
+    @cached_property
+    def _log_current(self):
+        """ln(I) of the current after the first point, computed once."""
+        return np.log(self.np_current[1:])
+
+    @cached_property
+    def _inv_current(self):
+        """1/I of the current after the first point, computed once. Samples at zero current are NaN
+        and skipped by the fits."""
+        current = self.np_current[1:]
+        return np.reciprocal(current, out=np.full(current.shape, np.nan), where=current != 0)
 
     def analyze(self):
         """ Analyze the data to calculate the diffusion coefficient and reaction rate constant:
         1. Calculate the diffusion coefficient using Cottrell analysis.
         2. Analyze the reaction kinetics to determine if the reaction is first or second order.
         """
-        # Calculate diffusion coefficient
-        self._calculate_diffusion_coefficient()
-
-        # Reaction kinetics analysis
+        if not use_parallel_fits(len(self.np_time)):
+            # Calculate diffusion coefficient
+            self._calculate_diffusion_coefficient()
+            # Reaction kinetics analysis
+            self._analyze_reaction_kinetics()
+            return
+        # Both analyses fit independent transforms of the data, the compiled fits release the GIL.
+        # The single Cottrell fit runs in the pool, the kinetic fits spread over the pool from this thread.
+        diffusion = get_fit_pool().submit(self._calculate_diffusion_coefficient)
         self._analyze_reaction_kinetics()
+        diffusion.result()
 
 
     def _calculate_diffusion_coefficient(self):
         """ Calculate the diffusion coefficient using Cottrell analysis."""
         log.info("Calculating diffusion coefficient using Cottrell analysis...")
         # Find the best linear region for Cottrell analysis
-        t_inv_sqrt = np.sqrt(1 / self.np_time[1:])  # Avoid division by zero
-        best_fit = self.analyze_best_linear_fit(t_inv_sqrt, self.np_current[1:])
+        best_fit = self.analyze_best_linear_fit(self._t_inv_sqrt, self.np_current[1:])
         slope = best_fit['slope']
         # Calculate D using the slope
         # Unit of D: cm^2/s
         # Cortrell equation: I = (nFAD^1/2 * C)/ (pi^1/2 * t^1/2)
-        self.diffusion_coefficient = (slope ** 2 * np.pi) / (self.number_of_electrons ** 2 * \
-                                                            self.faraday_constant ** 2 * \
-                                                            self.electrode_area ** 2 * \
-                                                            self.concentration_of_active_material ** 2)
+        self.diffusion_coefficient = slope * slope * self._cottrell_inv_denom
         log.info(f"Diffusion coefficient: {self.diffusion_coefficient} cm^2/s")
         self.best_fit_diffusion = best_fit
 
@@ -63,15 +107,13 @@ class Voltammetry_CA(Voltammetry, EChemProcedure):
         for the second order, the rate low: 1/I = 1/I0 + kt
         and calculate the rate constant accordingly.
         """
-        # Analyze for zero-order kinetics
-        log.info("Analyzing reaction kinetics for zero kinetic order...")
-        zero_order_fit = self.analyze_best_linear_fit(x_data=self.np_time[1:], y_data=self.np_current[1:])
-        # Analyze for first-order kinetics
-        log.info("Analyzing reaction kinetics for first kinetic order...")
-        first_order_fit = self.analyze_best_linear_fit(x_data=self.np_time[1:], y_data=np.log(self.np_current[1:]))
-        # Analyze for second-order kinetics
-        log.info("Analyzing reaction kinetics for second kinetic order...")
-        second_order_fit = self.analyze_best_linear_fit( x_data=self.np_time[1:], y_data=1/self.np_current[1:])
+        # Analyze for zero-, first- and second-order kinetics in one pass over the time
+        log.info("Analyzing reaction kinetics for zero, first and second kinetic order...")
+        kinetic_fits = self.analyze_best_linear_fits(x_data=self.np_time[1:],
+                                                     y_data={"zero": self.np_current[1:],
+                                                             "first": self._log_current,
+                                                             "second": self._inv_current})
+        zero_order_fit, first_order_fit, second_order_fit = kinetic_fits["zero"], kinetic_fits["first"], kinetic_fits["second"]
 
 
         # Determine which order fits best
@@ -130,9 +172,9 @@ class Voltammetry_CA(Voltammetry, EChemProcedure):
                 if self.reaction_order == 0:
                     y_data = self.np_current[1:]
                 elif self.reaction_order == 1:
-                    y_data = np.log(self.np_current[1:])
+                    y_data = self._log_current
                 elif self.reaction_order == 2:
-                    y_data = 1/self.np_current[1:]
+                    y_data = self._inv_current
                 plot.log_CA(subplot_ax=sub_ax, y_data = y_data,
                             reaction_rate=self.reaction_rate_constant,
                             reaction_order=self.reaction_order,
@@ -199,6 +241,7 @@ class Voltammetry_CA(Voltammetry, EChemProcedure):
         self.analyze()
         self.plot(save_dir, plots, optional_name=optional_name)
         self.save_data(save_dir=save_dir, optional_name=optional_name)
+        wait_for_saved_plots()
 
     @property
     def figure(self):
@@ -12,6 +12,7 @@ import ruptures as rpt
 from madap.utils import utils
 from madap.echem.voltammetry.voltammetry import Voltammetry
 from madap.echem.procedure import EChemProcedure
+from madap.plotting.plotting import wait_for_saved_plots
 from madap.logger import logger
 
 from madap.echem.voltammetry.voltammetry_plotting import VoltammetryPlotting as voltPlot
@@ -140,6 +141,7 @@ class Voltammetry_CP(Voltammetry, EChemProcedure):
         self.analyze()
         self.plot(save_dir, plots, optional_name=optional_name)
         self.save_data(save_dir=save_dir, optional_name=optional_name)
+        wait_for_saved_plots()
 
 
     def _impute_mean_nearest_neighbors(self, data):
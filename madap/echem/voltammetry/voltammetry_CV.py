@@ -5,7 +5,6 @@ import time
 import numpy as np
 import pandas as pd
 
-from scipy.stats import linregress
 from scipy.signal import find_peaks
 
 from sklearn.metrics import r2_score
@@ -14,6 +13,7 @@ from sklearn.linear_model import LinearRegression
 from madap.utils import utils
 from madap.echem.voltammetry.voltammetry import Voltammetry
 from madap.echem.procedure import EChemProcedure
+from madap.plotting.plotting import wait_for_saved_plots
 from madap.logger import logger
 
 from madap.echem.voltammetry.voltammetry_plotting import VoltammetryPlotting as voltPlot
@@ -35,6 +35,8 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         self.E_half_params = {}
         self.smoothing_window_size = 1
         self.data = None
+        self._scan_data = {}
+        self._faradaic_fits = {}
         self.temperature = float(args.temperature) if args.temperature is not None else 298.15 # Unit: K
         self.cycle_list = cycle_list
         self.tafel_data = {}
@@ -52,6 +54,8 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         self._find_fwd_bwd_scans()
         # Identify cycles
         self._identify_cycles()
+        # Split the data into its scans once
+        self._scan_data = dict(list(self.data.groupby(['cycle_number', 'scan_direction'], sort=False)))
         # Find peak cathodic and anodic currents and their corresponding values
         self._find_peak_currents()
         # calculate the E half
@@ -108,6 +112,19 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         self.data['cycle_number'] = cycle_numbers
 
 
+    def _get_scan_data(self, cycle_number, scan_direction):
+        """ Get the data of one scan of a cycle.
+
+        Args:
+            cycle_number (int): Cycle number
+            scan_direction (str): Scan direction (F or B)
+
+        Returns:
+            pd.DataFrame: Data of the scan, empty if the cycle has no such scan
+        """
+        return self._scan_data.get((cycle_number, scan_direction), self.data.iloc[:0])
+
+
     def _find_peak_currents(self):
         """ Find the peak currents in the data and store them in the appropriate dictionary.
         """
@@ -115,7 +132,7 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         for cycle in self.data['cycle_number'].unique():
             for direction in ['F', 'B']:
                 # Filter the data for the current cycle and direction
-                cycle_data = self.data[(self.data['cycle_number'] == cycle) & (self.data['scan_direction'] == direction)].copy()
+                cycle_data = self._get_scan_data(cycle, direction).copy()
                 # smoothen current
                 smoothen_current = cycle_data['current'].rolling(window=1).mean()
                 # Identify peaks
@@ -141,16 +158,17 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         peak_dict = self.cathodic_peak_params if peak_type == 'cathodic' else self.anodic_peak_params
         peak_dict[f'cycle_{cycle_num}'] = {}
         for peak in peaks:
+            # Positional access to the single values, no row Series is built per lookup
             if self.applied_scan_rate is not None:
                 peak_scan_rate = self.applied_scan_rate
-            elif data.iloc[peak]['scan_rate'] is not None:
-                peak_scan_rate = data.iloc[peak]['scan_rate']
+            elif data['scan_rate'].iat[peak] is not None:
+                peak_scan_rate = data['scan_rate'].iat[peak]
             else:
                 log.warning("No scan rate found in the data. Using 1 V/s as default.")
                 peak_scan_rate = 1
             peak_data = {
-                'current': data.iloc[peak]['current'],
-                'voltage': data.iloc[peak]['voltage'],
+                'current': data['current'].iat[peak],
+                'voltage': data['voltage'].iat[peak],
                 #'index': data.index[peak],
                 'cycle_num': cycle_num,
                 'direction': scan_direction,
@@ -251,8 +269,13 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
     def _find_peak_and_tafel_params(self):
         """ Find the peak parameters for each anodic and cathodic peak.
         """
+        self._faradaic_fits = {}
         for cycle, _ in self.E_half_params.items():
             self.tafel_data[cycle] = {}
+            # filter the cycle once for all of its peak pairs
+            cycle_number = int(cycle.split("_")[1])
+            backward_data = self._get_scan_data(cycle_number, "B")
+            forward_data = self._get_scan_data(cycle_number, "F")
             for pair in self.E_half_params[cycle].keys():
                 self.tafel_data[cycle][pair] = {}
                 peak_anodic_number = self.E_half_params[cycle][pair]['anodic_peak']
@@ -260,28 +283,21 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
 
                 # calculate the overpotential
                 self._find_overpotential(cycle, pair, peak_anodic_number, peak_cathodic_number)
-                cycle_number = int(cycle.split("_")[1])
                 # check if the cathodic peak  can be calculated
-                if self.data.loc[(self.data['voltage'] > self.anodic_peak_params[cycle][peak_anodic_number]['voltage']) & \
-                                 (self.data['cycle_number'] == cycle_number) & \
-                                 (self.data['scan_direction'] == "B")].empty:
+                if not (backward_data['voltage'].values > self.anodic_peak_params[cycle][peak_anodic_number]['voltage']).any():
                     log.warning("No voltage values higher than the half voltage and in the same cycle and \
                                 backward scan and the height of the cathodic peak current cannot be calculated")
                 else:
                     # filtered cathodic data
-                    filter_cathodic_data = self.data[(self.data['cycle_number'] == cycle_number) & (self.data['scan_direction'] == "B")].copy()
-                    self._find_height_of_cathodic_peak_current(cycle, pair, peak_cathodic_number, filter_cathodic_data )
+                    self._find_height_of_cathodic_peak_current(cycle, pair, peak_cathodic_number, backward_data.copy())
 
                 # check if the anodic peak  can be calculated
-                if self.data.loc[(self.data['voltage'] < self.cathodic_peak_params[cycle][peak_cathodic_number]['voltage']) & \
-                                 (self.data['cycle_number'] == cycle_number) & \
-                                 (self.data['scan_direction'] == "F")].empty:
+                if not (forward_data['voltage'].values < self.cathodic_peak_params[cycle][peak_cathodic_number]['voltage']).any():
                     log.warning("No voltage values lower than the half voltage and in the same cycle and \
                         forward scan and the height of the anodic peak current cannot be calculated")
                 else:
                     # filtered anodic data
-                    filter_anodic_data = self.data[(self.data['cycle_number'] == cycle_number) & (self.data['scan_direction'] == "F")].copy()
-                    self._find_height_of_anodic_peak_current(cycle, pair, peak_anodic_number, filter_anodic_data )
+                    self._find_height_of_anodic_peak_current(cycle, pair, peak_anodic_number, forward_data.copy())
                 if self.regression:
                     log.info(f"Finished calculating the height of the peaks for cycle {cycle} and pair {pair}")
                     self._find_tafel_region(cycle, peak_number=peak_cathodic_number, reaction_type="cathodic")
@@ -330,16 +346,16 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         index_of_I_half_voltage = max(filter_cathodic_data.index[filter_cathodic_data['voltage'] >= self.E_half_params[cycle][pair]['E_half']])
         # find the fitting window size
         fitting_window = int(len(filter_cathodic_data[:index_of_I_half_voltage]) / 6)
+        voltages, currents = smoothened_data['voltage'].to_numpy(), smoothened_data['current'].to_numpy()
 
         for i in range(len(smoothened_data.loc[:index_of_I_half_voltage])):
             # select two points and fit a line
-
-            point1, point2 = smoothened_data.iloc[i], smoothened_data.iloc[i+fitting_window]
+            point1 = {"voltage": voltages[i], "current": currents[i]}
+            point2 = {"voltage": voltages[i+fitting_window], "current": currents[i+fitting_window]}
             # check if the points are not nan
             if (abs(point1["current"]) < abs(point2["current"])) and (point1["voltage"] != point2["voltage"]):
-                slope, intercept, r_value, _, _ = linregress([point1['voltage'], point2['voltage']],
-                                                [point1['current'], point2['current']])
-                r2 = r_value**2
+                slope, intercept, r2 = self.linear_fit([point1['voltage'], point2['voltage']],
+                                                       [point1['current'], point2['current']])
                 # find the intersection between the line and x = cathodic_peak_voltage in order to find y = I_height
                 intersect_y = self._calculate_intersection(slope, intercept, cathodic_peak_voltage)
                 if intersect_y > cathodic_peak_current:
@@ -381,14 +397,15 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         filter_anodic_data['current'] = filter_anodic_data['current'].rolling(window=self.smoothing_window_size).mean()
         index_of_I_half_voltage = max(filter_anodic_data.index[filter_anodic_data['voltage'] <= self.E_half_params[cycle][pair]['E_half']])
         fitting_window = int(len(filter_anodic_data[:index_of_I_half_voltage]) / 6)
+        voltages, currents = filter_anodic_data['voltage'].to_numpy(), filter_anodic_data['current'].to_numpy()
 
         for i in range(len(filter_anodic_data.loc[:index_of_I_half_voltage-fitting_window])):
             # select two points and fit a line
-            point1, point2 = filter_anodic_data.iloc[i], filter_anodic_data.iloc[i+fitting_window]
+            point1 = {"voltage": voltages[i], "current": currents[i]}
+            point2 = {"voltage": voltages[i+fitting_window], "current": currents[i+fitting_window]}
             if (abs(point1["current"]) > abs(point2["current"])) and (point1["voltage"] != point2["voltage"]):
-                slope, intercept, r_value, _, _ = linregress([point1['voltage'], point2['voltage']],
-                                                [point1['current'], point2['current']])
-                r2 = r_value**2
+                slope, intercept, r2 = self.linear_fit([point1['voltage'], point2['voltage']],
+                                                       [point1['current'], point2['current']])
                 intersect_y = self._calculate_intersection(slope, intercept, anodic_peak_voltage)
                 if intersect_y < anodic_peak_current:
                     distance_to_peak = anodic_peak_current - intersect_y
@@ -458,7 +475,7 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         cycle_number = int(cycle.split("_")[1])
         e_half = self.E_half_params[cycle][f"pair_{peak_number}"]["E_half"]
         # filter the data
-        data = self.data[(self.data['cycle_number'] == cycle_number) & (self.data['scan_direction'] == scan_direction)].copy()
+        data = self._get_scan_data(cycle_number, scan_direction).copy()
         # filter the data between the peak voltage and the half voltage or between the peak voltage and the next peak voltage
         data_for_fitting = self._check_multiple_peaks(data=data, cycle=cycle, peak_number=peak_number,
                                                       reaction_type=reaction_type, e_half=e_half)
@@ -487,6 +504,29 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
             reaction_type (str): Type of reaction (anodic or cathodic)
             max_points (int, optional): Maximum number of points to consider for the linear regression. Defaults to None.
         """
+        peak_params = self.anodic_peak_params if reaction_type == "anodic" else self.cathodic_peak_params
+        # the fit only depends on the peak, a peak shared by several pairs is fitted once
+        fit_key = (cycle, peak_number, reaction_type, max_points)
+        if fit_key in self._faradaic_fits:
+            log.info(f"Reusing the linear regression model for cycle {cycle} and {reaction_type} peak {peak_number}")
+        else:
+            self._faradaic_fits[fit_key] = self._fit_faradaic_region(sorted_data, cycle, peak_number, reaction_type, max_points)
+        peak_params[cycle][peak_number].update(self._faradaic_fits[fit_key])
+
+
+    def _fit_faradaic_region(self, sorted_data, cycle, peak_number, reaction_type, max_points=None):
+        """ Find the linear region of the Tafel plot with the best linear regression fit.
+
+        Args:
+            sorted_data (pd.DataFrame): Sorted dataframe
+            cycle (str): Cycle number
+            peak_number (str): Peak number of the anodic or cathodic peak
+            reaction_type (str): Type of reaction (anodic or cathodic)
+            max_points (int, optional): Maximum number of points to consider for the linear regression. Defaults to None.
+
+        Returns:
+            dict: Slope, intercept, R^2, size, start and end point of the best fit, and the transfer coefficient alpha.
+        """
         # initialize the best fit parameters
         best_fit_slope = 0
         best_fit_r2 = float("-inf")
@@ -516,7 +556,7 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
                 y_data = subset['log_current']
 
                 # Fit the linear regression model
-                model = LinearRegression(n_jobs=4).fit(X_data, y_data)
+                model = LinearRegression().fit(X_data, y_data)
                 y_pred = model.predict(X_data)
 
                 # Calculate R^2 value
@@ -544,23 +584,13 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
             peak {peak_number} in {(end_time - start_time):.2f} seconds.")
         log.info(f"Best R^2 value is {best_fit_r2:.2f}.")
 
-        if reaction_type == "anodic":
-            self.anodic_peak_params[cycle][peak_number]["faradaic_slope"] = best_fit_slope
-            self.anodic_peak_params[cycle][peak_number]["faradaic_intercept"] = best_fit_intercept
-            self.anodic_peak_params[cycle][peak_number]["faradaic_r2"] = best_fit_r2
-            self.anodic_peak_params[cycle][peak_number]["faradaic_size"] = best_fit_size
-            self.anodic_peak_params[cycle][peak_number]["faradaic_start_point"] = start_point
-            self.anodic_peak_params[cycle][peak_number]["faradaic_end_point"] = end_point
-            self.anodic_peak_params[cycle][peak_number]["alpha"] = alpha
-
-        elif reaction_type == "cathodic":
-            self.cathodic_peak_params[cycle][peak_number]["faradaic_slope"] = best_fit_slope
-            self.cathodic_peak_params[cycle][peak_number]["faradaic_intercept"] = best_fit_intercept
-            self.cathodic_peak_params[cycle][peak_number]["faradaic_r2"] = best_fit_r2
-            self.cathodic_peak_params[cycle][peak_number]["faradaic_size"] = best_fit_size
-            self.cathodic_peak_params[cycle][peak_number]["faradaic_start_point"] = start_point
-            self.cathodic_peak_params[cycle][peak_number]["faradaic_end_point"] = end_point
-            self.cathodic_peak_params[cycle][peak_number]["alpha"] = alpha
+        return {"faradaic_slope": best_fit_slope,
+                "faradaic_intercept": best_fit_intercept,
+                "faradaic_r2": best_fit_r2,
+                "faradaic_size": best_fit_size,
+                "faradaic_start_point": start_point,
+                "faradaic_end_point": end_point,
+                "alpha": alpha}
 
 
     def _check_multiple_peaks(self, data, cycle, peak_number, reaction_type, e_half):
@@ -770,6 +800,7 @@ class Voltammetry_CV(Voltammetry, EChemProcedure):
         except ValueError as e:
             raise e
         self.save_data(save_dir=save_dir, optional_name=optional_name)
+        wait_for_saved_plots()
 
 
     @property
@@ -68,7 +68,7 @@ class VoltammetryPlotting(Plots):
 
         # Plot a scatterplot where x is time and y is current with a label of applied voltage
         if legend:
-            subplot_ax.scatter(self.time, current_mA, label=f"{measured_voltage:.2f} V", s=2, color="#435a82")
+            subplot_ax.scatter(self.time, current_mA, label=f"{measured_voltage:.2f} V", s=2, color="#435a82", rasterized=True)
         else:
             subplot_ax.plot(self.time, current_mA, linewidth=0.9, color="#435a82")
         if y_lim_min == "auto":
@@ -108,7 +108,7 @@ class VoltammetryPlotting(Plots):
         subplot_ax.plot(x_vals, y_vals, color="#a8212a", linewidth=2, linestyle='--', label="Instantaneous rate")
         # MArk the instantaneous rate on the plot
         #subplot_ax.scatter(x_vals, y_vals, color="#660d33", s=5, marker='x', linewidth=2, label="Intercept")
-        subplot_ax.scatter(self.time[1:], y_data, s=2, label=label, color="#396b82", zorder=0)
+        subplot_ax.scatter(self.time[1:], y_data, s=2, label=label, color="#396b82", zorder=0, rasterized=True)
         self.plot_identity(subplot_ax, xlabel="Time (s)", ylabel=y_label, ax_sci_notation="x",
                             x_lim=[0, max(self.time)], y_lim=[min(y_data)*0.6, max(y_data)*1.1])
         subplot_ax.legend(loc="upper right")
@@ -135,7 +135,7 @@ class VoltammetryPlotting(Plots):
         # Change the unit of charge from As to mAh
         charge, y_label = self._charge_conversion()
         charge = np.abs(charge)
-        subplot_ax.scatter(time_h, charge, label=label, s=2, color="#2e8b7e")
+        subplot_ax.scatter(time_h, charge, label=label, s=2, color="#2e8b7e", rasterized=True)
         self.plot_identity(subplot_ax, xlabel="Time (h)", ylabel=y_label,
                            ax_sci_notation="both", x_lim=[0, max(time_h)], y_lim=[0, max(charge)])
         # If the charge increases the legend is placed in the lower right corner
@@ -156,12 +156,13 @@ class VoltammetryPlotting(Plots):
             x_vals = np.array([x_data[best_fit_diffusion['start']], x_data[best_fit_diffusion['end']]])
             y_data = self.current
             y_vals = best_fit_diffusion['slope']*x_vals + best_fit_diffusion['intercept']
-            subplot_ax.scatter(x_data[1:], y_data[1:], s=2, label="D="+f"{diffusion_coefficient:.2e} cm^2/s", color="#4a467b")
+            subplot_ax.scatter(x_data[1:], y_data[1:], s=2, label="D="+f"{diffusion_coefficient:.2e} cm^2/s", color="#4a467b", rasterized=True)
             subplot_ax.plot(x_vals, y_vals, color="#a8212a", linewidth=1.5, linestyle='--', label="Diffusion coefficient")
             y_label = r"$I (A)$"
         elif self.procedure_type == "Voltammetry_CP":
             y_data = self.voltage
-            subplot_ax.scatter(x_data[1:], y_data[1:], s=2, label="D="+f"{diffusion_coefficient:.2e}"+r"$\cdot \tau$"+" cm^2/s", color="#4a467b")
+            subplot_ax.scatter(x_data[1:], y_data[1:], s=2, label="D="+f"{diffusion_coefficient:.2e}"+r"$\cdot \tau$"+" cm^2/s",
+                               color="#4a467b", rasterized=True)
             y_label = r"$Voltage (V)$"
 
         self.plot_identity(subplot_ax, xlabel=r"$t^{-1/2}  [s^{-1/2}]$", ylabel=y_label,
@@ -182,7 +183,7 @@ class VoltammetryPlotting(Plots):
         log.info("Creating Anson plot")
         x_data = (self.time)**(0.5)
         y_data = self.cumulative_charge
-        subplot_ax.scatter(x_data, y_data, s=2, label="D="+f"{diffusion_coefficient:.2e} cm^2/s", color="#317a80")
+        subplot_ax.scatter(x_data, y_data, s=2, label="D="+f"{diffusion_coefficient:.2e} cm^2/s", color="#317a80", rasterized=True)
         self.plot_identity(subplot_ax, xlabel=r"$t^{1/2}  [s^{1/2}]$", ylabel="Charge (C)",
                             ax_sci_notation="both", x_lim=[0, max(x_data)], y_lim=[0, max(y_data)])
         subplot_ax.legend(loc="upper left")
@@ -198,7 +199,7 @@ class VoltammetryPlotting(Plots):
 
         charge, x_label = self._charge_conversion()
         charge = np.abs(charge)
-        subplot_ax.scatter(charge, self.voltage, s=3, color="#3b9f7a")
+        subplot_ax.scatter(charge, self.voltage, s=3, color="#3b9f7a", rasterized=True)
         self.plot_identity(subplot_ax, xlabel=x_label, ylabel="Voltage (V)",
                            ax_sci_notation="both", x_lim=[min(charge), max(charge)], y_lim=[min(self.voltage), max(self.voltage)])
 
@@ -274,9 +275,9 @@ class VoltammetryPlotting(Plots):
         """
         log.info("Creating voltage plot")
         if self.procedure_type == "Voltammetry_CP":
-            subplot_ax.scatter(self.time, self.voltage, s=2, label=f"{np.abs(np.mean(self.current)):.2e} A", color="#482b68")
+            subplot_ax.scatter(self.time, self.voltage, s=2, label=f"{np.abs(np.mean(self.current)):.2e} A", color="#482b68", rasterized=True)
         elif self.procedure_type == "Voltammetry_CA":
-            subplot_ax.scatter(self.time, self.voltage, s=2, color="#482b68")
+            subplot_ax.scatter(self.time, self.voltage, s=2, color="#482b68", rasterized=True)
         if y_lim_min == "auto":
             y_lim_min = min(self.voltage)
         else:
@@ -352,14 +353,18 @@ class VoltammetryPlotting(Plots):
             complementary_colors = [utils.get_complementary_color(color) for color in tab10_colors]
         else:
             colors = plt.cm.winter(np.linspace(0, 1, len(cycle_list)))
+        # Split the data into its cycles once
+        cycles_data = dict(list(data.groupby("cycle_number", sort=False)))
+        has_scan_rate = not data['scan_rate'].isnull().values.any()
         # Loop through cycle with the plotted_cycle_frequency
         for cycle_num in cycle_list:
+            cycle_data = cycles_data.get(cycle_num, data.iloc[:0])
             # check if data['scan_rate'] is not None
-            if not data['scan_rate'].isnull().values.any():
-                label_name = f"Cyc. {cycle_num}@"+r"$\nu $"+"="+f"{data['scan_rate'][data['cycle_number']==cycle_num].mean() :.1f} V/s"
+            if has_scan_rate:
+                label_name = f"Cyc. {cycle_num}@"+r"$\nu $"+"="+f"{cycle_data['scan_rate'].mean() :.1f} V/s"
             else:
                 label_name = f"Cyc. {cycle_num}"
-            subplot_ax.plot(data[data["cycle_number"] == cycle_num]["voltage"], data[data["cycle_number"] == cycle_num]["current"],\
+            subplot_ax.plot(cycle_data["voltage"], cycle_data["current"],\
                             linewidth=0.9, color=colors[cycle_num-1], label=label_name)
 
             cycle = f"cycle_{cycle_num}"
@@ -607,16 +612,15 @@ class VoltammetryPlotting(Plots):
         Returns:
             fig, ax: Figure and axis of the subplot.
         """
-        plt.close('all')
         if len(plots)==1:
-            fig = plt.figure(figsize=(3,2.5))
+            fig = self.get_fig(figsize=(3,2.5))
             spec = fig.add_gridspec(1, 1)
             ax = fig.add_subplot(spec[0,0])
             return fig, [ax]
 
         if len(plots) == 2:
             fig_size = 5.5
-            fig = plt.figure(figsize=(fig_size, 2.5))
+            fig = self.get_fig(figsize=(fig_size, 2.5))
             spec = fig.add_gridspec(1, 2)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2= fig.add_subplot(spec[0, 1])
@@ -624,7 +628,7 @@ class VoltammetryPlotting(Plots):
 
         if len(plots) == 3:
             fig_size= 8
-            fig = plt.figure(figsize=(fig_size, 2.5))
+            fig = self.get_fig(figsize=(fig_size, 2.5))
             spec = fig.add_gridspec(1, 3)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2 = fig.add_subplot(spec[0, 1])
@@ -632,7 +636,7 @@ class VoltammetryPlotting(Plots):
             return fig, [ax1, ax2, ax3]
 
         if len(plots) == 4:
-            fig = plt.figure(figsize=(6, 5))
+            fig = self.get_fig(figsize=(6, 5))
             spec = fig.add_gridspec(2, 2)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2= fig.add_subplot(spec[0, 1])
@@ -641,7 +645,7 @@ class VoltammetryPlotting(Plots):
             return fig, [ax1, ax2, ax3, ax4]
 
         if len(plots) == 5:
-            fig = plt.figure(figsize=(9, 5))
+            fig = self.get_fig(figsize=(9, 5))
             spec = fig.add_gridspec(2, 3)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2= fig.add_subplot(spec[0, 1])
@@ -651,7 +655,7 @@ class VoltammetryPlotting(Plots):
             return fig, [ax1, ax2, ax3, ax4, ax5]
 
         if len(plots) == 6:
-            fig = plt.figure(figsize=(9, 5))
+            fig = self.get_fig(figsize=(9, 5))
             spec = fig.add_gridspec(2, 3)
             ax1 = fig.add_subplot(spec[0, 0])
             ax2= fig.add_subplot(spec[0, 1])
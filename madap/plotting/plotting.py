@@ -1,35 +1,109 @@
 """ This module handels the general plotting functions for the MADAP application. """
 import os
 import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib as mpl
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 from madap.logger import logger
 
 
-mpl.use('svg')
+mpl.use('Agg')
 log = logger.get_logger("plotting")
+
+# Figures are written to disk in the background while the analysis carries on
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="madap_plot_io")
+# Figures are reused between plots of the same size. The figures and their pending saves are
+# kept per thread and released with the thread
+_FIGURE_CACHE = threading.local()
+
+
+def _thread_cache():
+    """Returns the cached figures and pending saves of the calling thread.
+
+    Returns:
+        tuple: dict of the figures by size, and dict of the pending save by figure
+    """
+    if not hasattr(_FIGURE_CACHE, "figures"):
+        _FIGURE_CACHE.figures = {}
+        _FIGURE_CACHE.pending_saves = {}
+    return _FIGURE_CACHE.figures, _FIGURE_CACHE.pending_saves
+
+
+def wait_for_saved_plots():
+    """Block until every figure the calling thread submitted through Plots.save_plot is written to disk.
+    Errors raised while saving are re-raised here.
+    """
+    _, pending_saves = _thread_cache()
+    pending = list(pending_saves.values())
+    pending_saves.clear()
+    wait(pending)
+    for future in pending:
+        future.result()
+
+
+def _load_style():
+    """Builds the rc parameters of the MADAP plots once: the matplotlib defaults,
+    the nature, science and no-latex stylesheets and the MADAP overrides.
+
+    Returns:
+        dict: rc parameters to apply to matplotlib
+    """
+    # The backend is chosen once at import and must not be reset by the defaults
+    style = {key: value for key, value in mpl.rcParamsDefault.items() if key != 'backend'}
+    style.update({'font.size': 20, 'axes.titlesize': 20})
+    style_path, _ = os.path.split(__file__)
+    for style_name in ('nature', 'science', 'no-latex'):
+        style.update(mpl.rc_params_from_file(os.path.join(style_path, 'styles', f'{style_name}.mplstyle'),
+                                             use_default_template=False))
+    style.update({'text.usetex': False, 'xtick.direction': 'in', 'ytick.direction': 'in'})
+    return style
+
+
+_STYLE = _load_style()
+
+
 class Plots():
     """_General class for multipurpose plotting
     """
     def __init__(self) -> None:
 
-        mpl.rcParams.update(mpl.rcParamsDefault)
-        mpl.rc('font', size=20)
-        mpl.rc('axes', titlesize=20)
-        style_path, _ =os.path.split(__file__)
-        plt.style.use([os.path.join(style_path, 'styles', 'nature.mplstyle'),
-                       os.path.join(style_path, 'styles', 'science.mplstyle'),
-                       os.path.join(style_path, 'styles', 'no-latex.mplstyle')])
-        plt.rcParams['text.usetex'] = False
-        plt.rcParams['xtick.direction'] = 'in'
-        plt.rcParams['ytick.direction'] = 'in'
+        mpl.rcParams.update(_STYLE)
         self.plot_type = ""
         self.ax = None
 
 
+    def get_fig(self, figsize):
+        """Returns an empty figure of the given size. The figure is cached and cleared for
+        the next plot of the same size in the same thread, once its pending save is written.
+        The figure property of a procedure is therefore redrawn by the next procedure plotted
+        with the same layout in the same thread; copy it beforehand to keep it.
+
+        Args:
+            figsize (tuple): width and height of the figure in inches
+
+        Returns:
+            matplotlib.figure.Figure: the cleared figure
+        """
+        figures, pending_saves = _thread_cache()
+        fig = figures.get(figsize)
+        if fig is None:
+            fig = figures[figsize] = Figure(figsize=figsize)
+            return fig
+        pending = pending_saves.pop(fig, None)
+        if pending is not None:
+            pending.result()
+        fig.clf()
+        # Some plots widen the figure and the GUI changes its dpi
+        fig.set_size_inches(figsize)
+        fig.set_dpi(mpl.rcParams['figure.dpi'])
+        return fig
+
+
     def plot_identity(self, ax, xlabel:str=None, ylabel:str=None, x_lim:list=None, y_lim:list=None,
                       rotation:float=0, ax_sci_notation:bool=False, scientific_limit=0,
                       log_scale:str=None, step_size_x="auto", step_size_y="auto", x_label_fontsize=9, y_label_fontsize=9):
@@ -108,7 +182,7 @@ class Plots():
             colorbar_label (str, optional): label of the colorbar. Defaults to None.
         """
 
-        color_bar = plt.colorbar(plot, ax=ax)
+        color_bar = ax.figure.colorbar(plot, ax=ax)
 
         if colorbar_label:
             color_bar.set_label(colorbar_label, fontsize=7)
@@ -173,16 +247,30 @@ class Plots():
 
 
     def save_plot(self, fig, directory, name):
-        """Saves a plot
+        """Saves a plot in the background, see wait_for_saved_plots.
 
         Args:
-            fig (matplotlib.pyplot): figure to be saved
+            fig (matplotlib.figure.Figure): figure to be saved
             directory (str): directory in which the plot should be saved
             name (str): name of the plot
         """
         log.info(f"Saving .png and .svg in {directory}")
-        fig.savefig(os.path.join(directory, f"{name}.svg"), dpi=900)
-        fig.savefig(os.path.join(directory, f"{name}.png"), dpi=900)
+        _thread_cache()[1][fig] = _IO_POOL.submit(self._write_plot, fig, directory, name)
+
+    @staticmethod
+    def _write_plot(fig, directory, name):
+        """Writes a plot as .svg and .png, the two formats are written one after the other
+        since a figure must not be drawn by two threads at once.
+
+        Args:
+            fig (matplotlib.figure.Figure): figure to be saved
+            directory (str): directory in which the plot should be saved
+            name (str): name of the plot
+        """
+        canvas = FigureCanvasAgg(fig)
+        # Only the rasterized data artists depend on the dpi of the svg, the axes stay vectorial
+        canvas.print_figure(os.path.join(directory, f"{name}.svg"), dpi=300)
+        canvas.print_figure(os.path.join(directory, f"{name}.png"), dpi=900)
 
     def _cv_legend(self, subplot_ax):
         """Create the legend for the CV plot. The legend is created by combining the legend entries
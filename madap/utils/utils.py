@@ -2,12 +2,16 @@
 import time
 import json
 import os
+from importlib.util import find_spec
 
 import numpy as np
 import pandas as pd
 
 from madap.logger import logger
 
+# pyarrow is only imported by pandas when a parquet file is written
+PARQUET_AVAILABLE = find_spec("pyarrow") is not None
+
 
 
 log = logger.get_logger("utils")
@@ -39,16 +43,19 @@ def assemble_file_name(*args):
 
 
 def assemble_data_frame(**kwargs):
-    """Assemble a data frame from the given arguments
+    """Assemble a data frame from the given arguments. Each argument becomes one column
+    with its own dtype, the columns are aligned by position and shorter ones are padded with NaN.
 
     Returns:
         Pandas DataFrame: The assembled data frame
     """
-    try:
-        df = pd.DataFrame.from_dict(kwargs, orient = "index")
-        df = df.transpose()
-    except AttributeError:
-        df = pd.DataFrame(data=kwargs)
+    # Join all the columns at once instead of building the frame row-wise and transposing it
+    df = pd.concat([pd.Series(np.atleast_1d(np.asarray(value)), name=key) for key, value in kwargs.items()],
+                   axis=1)
+    # Keep the row labels of the original data, as the row-wise construction did
+    first_column = next(iter(kwargs.values()), None)
+    if isinstance(first_column, pd.Series) and len(first_column) == len(df):
+        df.index = first_column.index
     return df
 
 
@@ -64,6 +71,28 @@ def save_data_as_csv(directory, data, name):
     data.to_csv(os.path.join(directory, name))
 
 
+def save_data_as_parquet(directory, data, name):
+    """Save the given data as parquet. Parquet has no complex type, so complex columns
+    are stored as a real and an imaginary float column.
+
+    Args:
+        directory (str): The directory where the data should be saved
+        data (Pandas DataFrame): The data that should be saved
+        name (str): The name of the file
+    """
+    log.info(f"Saving data in {directory}.parquet")
+    columns = {}
+    for column, values in data.items():
+        if np.iscomplexobj(values):
+            # NaN padding is NaN + 0j, keep the missing cells missing in both parts
+            missing = np.isnan(values)
+            columns[f"{column} real"] = np.where(missing, np.nan, np.real(values))
+            columns[f"{column} imag"] = np.where(missing, np.nan, np.imag(values))
+        else:
+            columns[column] = values
+    pd.DataFrame(columns, index=data.index).to_parquet(os.path.join(directory, name))
+
+
 def save_data_as_json(directory, data, name):
     """Save the given data as json
 
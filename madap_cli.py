@@ -16,6 +16,8 @@ from madap.echem.voltammetry import voltammetry_CA, voltammetry_CP, voltammetry_
 
 
 log = logger.setup_applevel_logger(file_name = 'madap_debug.log')
+# Separator of the row and column selections given with --specific
+_SPECIFIC_SEPARATOR_RE = re.compile('; |;')
 
 def _analyze_parser_args():
     """Private function to analyze the parser arguments
@@ -172,7 +174,7 @@ def call_impedance(data, result_dir, args):
             if len(args.specific) >= 3:
                 row_col = args.specific
             else:
-                row_col = re.split('; |;', args.specific[0])
+                row_col = _SPECIFIC_SEPARATOR_RE.split(args.specific[0])
 
         except ValueError as e:
             log.error("The format of the specific data is not correct. Please check the help.")
@@ -209,7 +211,7 @@ def call_impedance(data, result_dir, args):
         # Instantiate the procedure
         procedure = e_impedance.EIS(impedance, voltage=args.voltage,
                                     suggested_circuit=args.suggested_circuit,
-                                    initial_value=eval(args.initial_values)
+                                    initial_value=da.parse_literal(args.initial_values)
                                     if args.initial_values else None,
                                     cell_constant=args.cell_constant)
 
@@ -254,7 +256,7 @@ def call_arrhenius(data, result_dir, args):
             if len(args.specific) == 2:
                 row_col = args.specific
             else:
-                row_col = re.split('; |;', args.specific[0])
+                row_col = _SPECIFIC_SEPARATOR_RE.split(args.specific[0])
 
         except ValueError as e:
             log.error("The format of the specific data is not correct. Please check the help.")
@@ -304,7 +306,7 @@ def call_voltammetry(data, result_dir, args):
         charge_data = da.format_data(data[header_names[3]])
     else:
         charge_data = None
-    cycle_list = da.format_list(eval(args.cycle_list)) if args.cycle_list else None
+    cycle_list = da.format_list(da.parse_literal(args.cycle_list)) if args.cycle_list else None
 
     if args.voltammetry_procedure == "CA":
         voltammetry_cls = voltammetry_CA.Voltammetry_CA(current=da.format_data(current_data),
@@ -20,7 +20,7 @@ requirements = ["attrs==21.4.0",
         "ruptures",
         "impedance==1.4.1"]
 
-test_requirements = ['pytest>=3', ]
+test_requirements = ['pytest>=3', 'pyarrow', ]
 
 setup(
     author="Fuzhan Rahmanian",
@@ -49,7 +49,9 @@ setup(
         ],
     },
     extras_require={
-        "dev": ["pytest>=3", ],
+        "dev": ["pytest>=3", "pyarrow", ],
+        "numba": ["numba"],
+        "parquet": ["pyarrow"],
     },
     install_requires=requirements,
     license="MIT license",
@@ -0,0 +1,91 @@
+"""Tests of the sliding-window linear fit kernels of the chrono amperometry analysis."""
+import warnings
+
+import numpy as np
+import pytest
+from scipy.stats import linregress
+
+from madap.echem.voltammetry._ca_kernels import _best_linear_window_numpy, best_linear_window
+
+
+def _linregress_best_window(x_data, y_data, window):
+    """Reference: the linregress loop the kernels replace."""
+    best_fit = (0, 0.0, 0.0, 0.0)
+    for start in range(len(x_data) - window + 1):
+        end = start + window
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                slope, intercept, r_value, _, _ = linregress(x_data[start:end], y_data[start:end])
+        except ValueError:
+            # linregress refuses a window with a constant x
+            continue
+        if r_value**2 > best_fit[3]:
+            best_fit = (start, slope, intercept, r_value**2)
+    return best_fit
+
+
+def _random_trace(seed, n_points=300):
+    rng = np.random.default_rng(seed)
+    time = np.sort(rng.uniform(0.1, 3600, n_points))
+    current = 1e-3 * np.exp(-time / rng.uniform(200, 2000)) + rng.normal(0, 1e-6, n_points)
+    return time, current
+
+
+def _with_non_finite(seed):
+    time, current = _random_trace(seed)
+    rng = np.random.default_rng(seed)
+    current[rng.integers(0, len(current), 4)] = np.nan
+    current[rng.integers(0, len(current), 2)] = np.inf
+    time[rng.integers(0, len(time), 2)] = np.nan
+    return time, current
+
+
+def _with_constant_parts(seed):
+    time, current = _random_trace(seed)
+    current[50:150] = current[50]
+    time[200:260] = time[200]
+    return time, current
+
+
+CASES = [_random_trace(seed) for seed in range(5)] + \
+        [_with_non_finite(seed) for seed in range(5)] + \
+        [_with_constant_parts(seed) for seed in range(3)]
+
+
+@pytest.mark.parametrize("kernel", [_best_linear_window_numpy, best_linear_window])
+@pytest.mark.parametrize("window", [3, 20, 120])
+@pytest.mark.parametrize("case", range(len(CASES)))
+def test_best_linear_window_matches_linregress(kernel, window, case):
+    x_data, y_data = (np.ascontiguousarray(values, dtype=np.float64) for values in CASES[case])
+    start, slope, intercept, r_squared = kernel(x_data, y_data, window)
+    ref_start, ref_slope, ref_intercept, ref_r_squared = _linregress_best_window(x_data, y_data, window)
+
+    assert r_squared == pytest.approx(ref_r_squared, abs=1e-9)
+    # Windows with an equal R^2 up to rounding may be picked in either order
+    if int(start) == ref_start:
+        assert slope == pytest.approx(ref_slope, rel=1e-6)
+        assert intercept == pytest.approx(ref_intercept, rel=1e-6, abs=1e-12)
+
+
+@pytest.mark.parametrize("kernel", [_best_linear_window_numpy, best_linear_window])
+def test_best_linear_window_constant_input(kernel):
+    x_data = np.linspace(0, 1, 50)
+    start, slope, intercept, r_squared = kernel(x_data, np.full(50, 2.0), 10)
+    assert (int(start), slope, intercept, r_squared) == (0, 0.0, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("kernel", [_best_linear_window_numpy, best_linear_window])
+@pytest.mark.parametrize("seed", range(5))
+def test_best_linear_window_offset_time_near_exact_line(kernel, seed):
+    # Timestamps far from zero and an almost noiseless line leave R^2 differences at rounding level
+    rng = np.random.default_rng(seed)
+    x_data = np.arange(1000.0) + 1e7
+    y_data = 0.1 - 1e-8 * (x_data - x_data[0]) + rng.normal(0, 1e-15, x_data.size)
+    start, _, _, r_squared = kernel(x_data, y_data, 8)
+    _, _, _, ref_r_squared = _linregress_best_window(x_data, y_data, 8)
+
+    assert r_squared <= 1.0
+    assert r_squared == pytest.approx(ref_r_squared, abs=1e-12)
+    start = int(start)
+    assert linregress(x_data[start:start + 8], y_data[start:start + 8]).rvalue**2 == pytest.approx(ref_r_squared, abs=1e-12)
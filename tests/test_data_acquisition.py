@@ -0,0 +1,28 @@
+"""Tests of the parsing of the data given as strings."""
+import pytest
+
+from madap.data_acquisition import data_acquisition as da
+
+
+@pytest.mark.parametrize("literal, expected", [
+    ("5", 5),
+    ("(5)", 5),
+    ("-1.5e-3", -1.5e-3),
+    ("[1.0, 2.0]", [1.0, 2.0]),
+    (" [1, 2]", [1, 2]),
+    ("[[1, 2], [3, 4]]", [[1, 2], [3, 4]]),
+    ("(1, 2)", (1, 2)),
+    ("1, 2", (1, 2)),
+    ("[1, (2, 3)]", [1, (2, 3)]),
+    ("[(1+2j), (3-4j)]", [1 + 2j, 3 - 4j]),
+])
+def test_parse_literal_matches_python_literals(literal, expected):
+    parsed = da.parse_literal(literal)
+    assert parsed == expected
+    assert type(parsed) is type(expected)
+
+
+@pytest.mark.parametrize("literal", ["__import__('os').getcwd()", "[open('setup.py')]", "[1, 2] + [3]"])
+def test_parse_literal_rejects_code(literal):
+    with pytest.raises(ValueError):
+        da.parse_literal(literal)
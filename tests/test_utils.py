@@ -0,0 +1,21 @@
+"""Tests of the data export helpers."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from madap.utils import utils
+
+
+def test_parquet_keeps_missing_complex_cells(tmp_path):
+    pytest.importorskip("pyarrow")
+    impedance = np.array([1.0 - 2.0j, complex(np.nan, 0.0), 3.0 + 0.5j])
+    data = utils.assemble_data_frame(frequency=[1e3, 1e2, 1e1, 1e0], impedance=impedance)
+
+    utils.save_data_as_parquet(tmp_path, data, "data.parquet")
+    written = pd.read_parquet(tmp_path / "data.parquet")
+
+    expected_real = [1.0, np.nan, 3.0, np.nan]
+    expected_imag = [-2.0, np.nan, 0.5, np.nan]
+    np.testing.assert_array_equal(written["impedance real"].to_numpy(), expected_real)
+    np.testing.assert_array_equal(written["impedance imag"].to_numpy(), expected_imag)
+    np.testing.assert_array_equal(written["frequency"].to_numpy(), [1e3, 1e2, 1e1, 1e0])